@@ -1,5 +1,5 @@
+import functools
 import logging
-import time
 
 from src.airtable_client import AirtableClient
 from src.config import Config
@@ -7,6 +7,25 @@ from src.scraper import InstagramScraper
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load the configuration once per process."""
+    return Config(config_path="config.yaml")
+
+
+@functools.lru_cache(maxsize=1)
+def get_airtable_client() -> AirtableClient:
+    """Build the Airtable client once so repeated runs reuse its session."""
+    return get_scraper().create_airtable_client()
+
+
+@functools.lru_cache(maxsize=1)
+def get_scraper() -> InstagramScraper:
+    """Build the scraper once so repeated runs reuse its connection pool."""
+    return InstagramScraper(get_config())
 
 
 def batch_update():
@@ -15,61 +34,38 @@ def batch_update():
     and updates their records.
     """
     try:
-        logging.info("--- Starting Batch Update Script ---")
+        logger.info("--- Starting Batch Update Script ---")
 
-        # Load configuration
-        config = Config(config_path="config.yaml")
-        airtable_config = config.get_airtable_config()
-
-        # Initialize AirtableClient
-        airtable_client = AirtableClient(
-            api_key=airtable_config["api_key"],
-            base_id=airtable_config["base_id"],
-            active_accounts_table=airtable_config["active_accounts_table"],
-        )
-
-        # Initialize InstagramScraper
-        scraper = InstagramScraper(config)
+        # Configuration and clients are built once per process
+        airtable_client = get_airtable_client()
+        scraper = get_scraper()
 
         # --- Fetch a small batch of accounts from Airtable ---
-        logging.info("Fetching a batch of 80 active accounts from Airtable...")
+        logger.info("Fetching a batch of 80 active accounts from Airtable...")
         active_accounts = airtable_client.get_active_accounts(max_records=80)
 
         if not active_accounts:
-            logging.warning("No active accounts found in Airtable to process.")
+            logger.warning("No active accounts found in Airtable to process.")
             return
 
-        total_accounts = len(active_accounts)
-        logging.info(f"Found {total_accounts} accounts to process.")
-
-        # --- Process each account ---
-        for i, (account_id, username, _) in enumerate(active_accounts, 1):
+        accounts = []
+        for account_id, username, _ in active_accounts:
             if not username:
-                logging.warning(
-                    f"Skipping account with ID {account_id} due to missing username."
+                logger.warning(
+                    "Skipping account with ID %s due to missing username.", account_id
                 )
                 continue
+            accounts.append((account_id, username))
+        logger.info("Found %d accounts to process.", len(accounts))
 
-            logging.info(
-                f"[{i}/{total_accounts}] Processing account: {username} (ID: {account_id})"
-            )
-            success = scraper.process_account(account_id, username, airtable_client)
-            if success:
-                logging.info(f"Successfully processed and updated {username}.")
-            else:
-                logging.error(f"Failed to process account {username}.")
-
-            if i < total_accounts:
-                logging.info(
-                    f"Waiting for {scraper.account_delay} seconds before next account."
-                )
-                time.sleep(scraper.account_delay)
+        # The scraper runs the accounts concurrently and flushes buffered writes
+        scraper.process_accounts(accounts, airtable_client)
 
-        logging.info("--- Batch Update Script Finished ---")
+        logger.info("--- Batch Update Script Finished ---")
 
     except Exception as e:
-        logging.error(
-            f"An error occurred during the batch update script: {e}", exc_info=True
+        logger.error(
+            "An error occurred during the batch update script: %s", e, exc_info=True
         )
 
 
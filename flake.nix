@@ -46,6 +46,7 @@
           google-auth-httplib2
           google-api-python-client
           requests
+          orjson
           python-lsp-server
           python-dotenv
           pandas
@@ -2,23 +2,47 @@ import argparse
 import logging
 import sys
 import traceback
+from typing import Iterable, List
 
-from pyairtable.formulas import match
 
-from src.airtable_client import AirtableClient
-from src.config import Config
-from src.scraper import InstagramScraper
+def clean_username(name: str) -> str:
+    """Trim whitespace and a leading @ from an Instagram handle"""
+    return name.strip().lstrip("@")
+
+
+def parse_usernames(names: Iterable[str]) -> List[str]:
+    """Clean handles, dropping blanks and duplicates while keeping the given order"""
+    cleaned = (clean_username(name) for name in names)
+    return list(dict.fromkeys(name for name in cleaned if name))
 
 
 def main():
     """Main function to run the Instagram scraper"""
+    scraper = None
     try:
         parser = argparse.ArgumentParser(description="Instagram scraper")
-        parser.add_argument(
+        accounts_group = parser.add_mutually_exclusive_group()
+        accounts_group.add_argument(
             "--username", type=str, help="Process a single username (profile only)"
         )
+        accounts_group.add_argument(
+            "--usernames",
+            type=str,
+            help="Process several comma-separated usernames (profile only)",
+        )
+        accounts_group.add_argument(
+            "--usernames-file",
+            type=argparse.FileType("r", encoding="utf-8"),
+            help="Process usernames from a file, one per line (profile only)",
+        )
         args = parser.parse_args()
 
+        # Imported after argument parsing so --help does not load the HTTP stack
+        from pyairtable.formulas import match
+
+        from src.config import Config
+        from src.scraper import InstagramScraper
+
         logging.info("🚀 Starting Instagram scraper")
 
         config = Config()
@@ -30,26 +54,43 @@ def main():
 
         if args.username:
             # Single account profile scraping mode
-            logging.info(f"🔍 Scraping profile for {args.username}")
-            airtable_config = config.get_airtable_config()
-            airtable_client = AirtableClient(
-                api_key=airtable_config["api_key"],
-                base_id=airtable_config["base_id"],
-                active_accounts_table=airtable_config["active_accounts_table"],
-            )
+            args.username = clean_username(args.username)
+            logging.info("🔍 Scraping profile for %s", args.username)
+            airtable_client = scraper.create_airtable_client()
             # Attempt to find account ID from Airtable by username
-            records = airtable_client.accounts_table.all(
-                formula=match({"Username": args.username})
+            record = airtable_client.accounts_table.first(
+                formula=match({"Username": args.username}),
+                fields=["Username"],
             )
-            if not records:
-                logging.warning(
-                    f"⚠️ Username '{args.username}' not found in base"
-                )
+            if not record:
+                logging.warning("⚠️ Username '%s' not found in base", args.username)
             else:
-                account_id = records[0]["id"]
-                scraper.process_account(account_id, args.username, airtable_client)
+                account_id = record["id"]
+                with airtable_client.deferred_writes():
+                    scraper.process_account(account_id, args.username, airtable_client)
                 logging.info("✅ Single account profile scraping completed")
 
+        elif args.usernames or args.usernames_file:
+            # Multiple account profile scraping mode, looked up in batches
+            if args.usernames_file:
+                with args.usernames_file as f:
+                    usernames = parse_usernames(f.read().splitlines())
+            else:
+                usernames = parse_usernames(args.usernames.split(","))
+            logging.info("🔍 Scraping profiles for %d usernames", len(usernames))
+            airtable_client = scraper.create_airtable_client()
+            account_ids = airtable_client.get_account_ids(usernames)
+            missing = [name for name in usernames if name not in account_ids]
+            if missing:
+                logging.warning(
+                    "⚠️ Usernames not found in base: %s", ", ".join(missing)
+                )
+            accounts = [
+                (account_ids[name], name) for name in usernames if name in account_ids
+            ]
+            scraper.process_accounts(accounts, airtable_client)
+            logging.info("✅ Multiple account profile scraping completed")
+
         else:
             # Normal full-base mode
             logging.info("📊 Starting data collection and history tracking")
@@ -61,10 +102,15 @@ def main():
         logging.info("✨ All operations completed successfully")
 
     except Exception as e:
-        logging.error(f"❌ Fatal error: {str(e)}", exc_info=True)
-        logging.error(f"Stack trace:\n{traceback.format_exc()}")
+        logging.error("❌ Fatal error: %s", e, exc_info=True)
+        logging.error("Stack trace:\n%s", traceback.format_exc())
         sys.exit(1)
 
+    finally:
+        # Release the HTTP session and response cache on every exit path
+        if scraper is not None:
+            scraper.instagram_api.close()
+
 
 if __name__ == "__main__":
     # Configure logging with timestamps
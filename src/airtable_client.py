@@ -1,89 +1,346 @@
+import hashlib
+import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from pyairtable import Api
-from pyairtable.formulas import AND, match
+import requests
+from pyairtable import Api, retry_strategy
+from pyairtable.formulas import AND, NOT, OR, match
+from requests.adapters import HTTPAdapter
+
+from src.rate_limiter import RateLimiter
+from src.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# (record id, username, follower count) as returned by get_active_accounts
+ActiveAccount = Tuple[str, str, int]
+
+# Airtable accepts at most 10 records per batch request
+BATCH_SIZE = 10
+# Airtable allows 5 requests per second per base
+REQUESTS_PER_SECOND = 5
+# Rows without a username cannot be scraped, so Airtable leaves them out
+HAS_USERNAME_FORMULA = NOT(match({"Username": ""}))
+# Formula used when no saved active-accounts view is configured
+ACTIVE_ACCOUNTS_FORMULA = AND(match({"Status": "Active"}), HAS_USERNAME_FORMULA)
+# Usernames matched per OR(...) lookup formula, keeping the query URL short
+USERNAME_LOOKUP_CHUNK = 100
+# Seconds a fetched active-accounts list is reused before querying again
+ACTIVE_ACCOUNTS_TTL = 60.0
+# Seconds an identical account write is skipped; after that it is sent again
+# so manual edits in Airtable are eventually overwritten
+UNCHANGED_WRITE_TTL = 24 * 3600
+# Fields left out of the unchanged-write digest: Instagram profile picture
+# URLs are signed and change on every fetch, and Airtable keeps its own copy
+# of the attachment, so a new URL alone is not worth a write
+DIGEST_IGNORED_FIELDS = frozenset(("PFP",))
+
+# One limiter per base, shared by every client talking to that base
+_base_rate_limiters: Dict[str, RateLimiter] = {}
+_base_rate_limiters_lock = threading.Lock()
+
+
+def get_base_rate_limiter(base_id: str) -> RateLimiter:
+    """Return the process-wide rate limiter for an Airtable base."""
+    with _base_rate_limiters_lock:
+        limiter = _base_rate_limiters.get(base_id)
+        if limiter is None:
+            limiter = RateLimiter(REQUESTS_PER_SECOND * 60)
+            _base_rate_limiters[base_id] = limiter
+        return limiter
+
+
+def _fields_digest(fields: Dict[str, Any]) -> str:
+    """Stable short hash of a record's fields, ignoring DIGEST_IGNORED_FIELDS."""
+    compared = {
+        name: value
+        for name, value in fields.items()
+        if name not in DIGEST_IGNORED_FIELDS
+    }
+    encoded = json.dumps(compared, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _is_validation_error(error: Exception) -> bool:
+    """Whether Airtable rejected the request's data (HTTP 422)."""
+    return (
+        isinstance(error, requests.exceptions.HTTPError)
+        and getattr(error.response, "status_code", None) == 422
+    )
+
+
+class RateLimitedApi(Api):
+    """pyairtable Api that waits for a rate limiter slot before each request.
+
+    Each request is paced by the limiter of the base in its URL, so one
+    instance and its connection pool can be shared by clients for any base.
+    """
+
+    def __init__(self, api_key: str):
+        super().__init__(
+            api_key,
+            retry_strategy=retry_strategy(
+                status_forcelist=(429, 500, 502, 503, 504), backoff_factor=0.5
+            ),
+        )
+
+        # Keep enough pooled connections alive for the batch worker threads
+        retrying_adapter = self.session.get_adapter("https://")
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=16,
+                max_retries=retrying_adapter.max_retries,
+            ),
+        )
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        # Every table call, page fetch and batch chunk goes through here;
+        # urls look like https://api.airtable.com/v0/{base_id}/{table}
+        base_id = url.split("/v0/", 1)[-1].split("/", 1)[0]
+        get_base_rate_limiter(base_id).acquire()
+        return super().request(method, url, *args, **kwargs)
 
 
 class AirtableClient:
-    def __init__(self, api_key: str, base_id: str, active_accounts_table: str):
-        """Initialize Airtable client for a specific base."""
-        self.logger = logging.getLogger(__name__)
-        self.logger.debug("Initializing AirtableClient")
-        self.api = Api(api_key)
+    __slots__ = (
+        "api",
+        "base_id",
+        "accounts_table",
+        "active_accounts_view",
+        "write_cache",
+        "_active_accounts_cache",
+        "_pending_updates",
+        "_pending_lock",
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        base_id: str,
+        active_accounts_table: str,
+        active_accounts_view: Optional[str] = None,
+        api: Optional[RateLimitedApi] = None,
+        write_cache_path: Optional[str] = None,
+    ):
+        """Initialize Airtable client for a specific base.
+
+        Pass a shared RateLimitedApi as ``api`` to reuse one connection pool
+        across clients, and a ``write_cache_path`` to skip writes whose fields
+        have not changed.
+        """
+        logger.debug("Initializing AirtableClient")
         self.base_id = base_id
-        self.logger.debug(f"Base ID: {self.base_id}")
+        self.api = api or RateLimitedApi(api_key)
+        logger.debug("Base ID: %s", self.base_id)
 
         # Initialize all tables
         self.accounts_table = self.api.table(self.base_id, active_accounts_table)
-        self.logger.debug("AirtableClient initialization complete")
 
-    def get_active_accounts(self, max_records: int = 0) -> List[Tuple[str, str, int]]:
+        # Saved view filtered on Status = Active, used instead of a formula
+        self.active_accounts_view = active_accounts_view
+        # Digests of the last fields written per account, kept across runs
+        self.write_cache = ResponseCache(write_cache_path) if write_cache_path else None
+        # max_records -> (fetched at, accounts) for repeat reads within a run
+        self._active_accounts_cache: Dict[int, Tuple[float, List[ActiveAccount]]] = {}
+
+        # Account writes are buffered and sent with batch_update
+        self._pending_updates: List[Dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+        logger.debug("AirtableClient initialization complete")
+
+    def get_active_accounts(self, max_records: int = 0) -> List[ActiveAccount]:
         """Get active accounts from the base with their follower counts."""
-        self.logger.info("Fetching active accounts")
+        cached = self._active_accounts_cache.get(max_records)
+        if cached is not None and time.monotonic() - cached[0] < ACTIVE_ACCOUNTS_TTL:
+            logger.debug("Using cached active accounts")
+            return list(cached[1])
+
+        logger.info("Fetching active accounts")
         try:
-            # Fetch only the fields we need to reduce data transfer
-            records = self.accounts_table.all(
-                formula=match({"Status": "Active"}),
+            if self.active_accounts_view:
+                query: Dict[str, Any] = {
+                    "view": self.active_accounts_view,
+                    "formula": HAS_USERNAME_FORMULA,
+                }
+            else:
+                query = {"formula": ACTIVE_ACCOUNTS_FORMULA}
+
+            # Fetch only the fields we need to reduce data transfer, and build
+            # the result page by page instead of materializing every record
+            pages = self.accounts_table.iterate(
+                **query,
                 fields=["Username", "Followers"],
                 max_records=max_records,
+                page_size=100,
             )
 
+            # Airtable always returns "fields", so bind it once per record
             active_accounts = [
-                (
-                    record["id"],
-                    record["fields"].get("Username"),
-                    record["fields"].get("Followers", 0),
-                )
-                for record in records
-                if "Username" in record.get("fields", {})
+                (record["id"], fields["Username"], fields.get("Followers", 0))
+                for page in pages
+                for record in page
+                if "Username" in (fields := record["fields"])
             ]
 
-            self.logger.info(f"Found {len(active_accounts)} active accounts")
-            return active_accounts
+            logger.info("Found %d active accounts", len(active_accounts))
+            self._active_accounts_cache[max_records] = (
+                time.monotonic(),
+                active_accounts,
+            )
+            return list(active_accounts)
         except Exception as e:
-            self.logger.error(f"Failed to fetch active accounts: {e}")
+            logger.error("Failed to fetch active accounts: %s", e)
             raise
 
-    def update_account(self, account_id: str, account_data: Dict[str, Any]) -> bool:
-        """Update account information."""
+    def get_account_ids(self, usernames: List[str]) -> Dict[str, str]:
+        """Map usernames to their account record IDs with batched lookups."""
+        account_ids: Dict[str, str] = {}
+        for start in range(0, len(usernames), USERNAME_LOOKUP_CHUNK):
+            chunk = usernames[start : start + USERNAME_LOOKUP_CHUNK]
+            formula = OR(*(match({"Username": username}) for username in chunk))
+            for page in self.accounts_table.iterate(
+                formula=formula, fields=["Username"]
+            ):
+                for record in page:
+                    username = record["fields"].get("Username")
+                    if username:
+                        account_ids.setdefault(username, record["id"])
+        return account_ids
+
+    def update_account(
+        self, account_id: str, account_data: Dict[str, Any], clear_error: bool = True
+    ) -> bool:
+        """Queue an account information update.
+
+        With clear_error False the record's existing 'API Error' is left as is,
+        e.g. when the data is a stale copy served during an API outage.
+        """
         try:
             formatted_data = self._format_account_data(account_data)
-            self.accounts_table.update(account_id, formatted_data)
-            self.logger.info(f"Updated account info for {account_id}")
+            if not clear_error:
+                del formatted_data["API Error"]
+            self._queue_update(account_id, formatted_data)
+            logger.debug("Queued account info update for %s", account_id)
             return True
         except Exception as e:
-            self.logger.error(f"Failed to update account {account_id}: {e}")
+            logger.error("Failed to update account %s: %s", account_id, e)
             return False
 
     def log_error(self, account_id: str, error_message: str) -> bool:
-        """Log an error message to the account's 'API Error' field."""
+        """Queue an error message for the account's 'API Error' field."""
         try:
-            self.accounts_table.update(
-                account_id, {"API Error": error_message, "Scraped": True}
-            )
-            self.logger.info(f"Logged error for account {account_id}")
+            self._queue_update(account_id, {"API Error": error_message, "Scraped": True})
+            logger.debug("Queued error for account %s", account_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to log error for account %s: %s", account_id, e)
+            return False
+
+    def flush_account_updates(self) -> bool:
+        """Send all queued account updates to Airtable in batches."""
+        with self._pending_lock:
+            pending = self._pending_updates
+            self._pending_updates = []
+        return self._send_updates(pending)
+
+    @contextmanager
+    def deferred_writes(self) -> Iterator["AirtableClient"]:
+        """Buffer account writes for the block, flushing them on exit or error."""
+        try:
+            yield self
+        finally:
+            self.flush_account_updates()
+
+    def _queue_update(self, account_id: str, fields: Dict[str, Any]) -> None:
+        """Buffer a record update, sending a batch once it is full."""
+        if self._is_unchanged(account_id, fields):
+            logger.debug("Skipping unchanged update for %s", account_id)
+            return
+
+        batch: List[Dict[str, Any]] = []
+        with self._pending_lock:
+            self._pending_updates.append({"id": account_id, "fields": fields})
+            if len(self._pending_updates) >= BATCH_SIZE:
+                batch = self._pending_updates
+                self._pending_updates = []
+        if batch:
+            self._send_updates(batch)
+
+    def _send_updates(self, records: List[Dict[str, Any]]) -> bool:
+        """Write records with batch_update, returning False if any write failed.
+
+        A batch rejected as invalid (422) is retried one record at a time so a
+        single bad record cannot drop the rest of its batch. Other failures
+        arrive after pyairtable's own retries, so the batch is not resent.
+        """
+        if not records:
             return True
+        try:
+            self.accounts_table.batch_update(records)
         except Exception as e:
-            self.logger.error(f"Failed to log error for account {account_id}: {e}")
+            account_ids = ", ".join(record["id"] for record in records)
+            if _is_validation_error(e):
+                logger.warning(
+                    "Batch update rejected for accounts %s, retrying individually: %s",
+                    account_ids,
+                    e,
+                )
+                return self._send_individually(records)
+            logger.error("Failed to update accounts %s: %s", account_ids, e)
             return False
 
+        logger.info("Updated %d account records", len(records))
+        for record in records:
+            self._remember_write(record)
+        return True
+
+    def _send_individually(self, records: List[Dict[str, Any]]) -> bool:
+        """Write records one at a time, returning False if any write failed."""
+        success = True
+        for record in records:
+            try:
+                self.accounts_table.update(record["id"], record["fields"])
+            except Exception as e:
+                logger.error("Failed to update account %s: %s", record["id"], e)
+                success = False
+                continue
+            logger.info("Updated account record %s", record["id"])
+            self._remember_write(record)
+        return success
+
+    def _remember_write(self, record: Dict[str, Any]) -> None:
+        """Record the digest of written fields so identical rewrites are skipped."""
+        if self.write_cache is not None:
+            digest = _fields_digest(record["fields"])
+            self.write_cache.set(record["id"], {"digest": digest})
+
+    def _is_unchanged(self, account_id: str, fields: Dict[str, Any]) -> bool:
+        """Whether these exact fields were written for the account recently."""
+        if self.write_cache is None:
+            return False
+        cached = self.write_cache.get(account_id, max_age=UNCHANGED_WRITE_TTL)
+        return cached is not None and cached.get("digest") == _fields_digest(fields)
+
     @staticmethod
     def _format_account_data(account_data: Dict[str, Any]) -> Dict[str, Any]:
         """Format account data for Airtable."""
-        profile_pic = account_data.get("profile_pic_url_hd") or account_data.get(
-            "profile_pic_url"
-        )
+        get = account_data.get
+        profile_pic = get("profile_pic_url_hd") or get("profile_pic_url")
         return {
-            "Username": account_data.get("username"),
-            "Bio": account_data.get("biography"),
+            "Username": get("username"),
+            "Bio": get("biography"),
             "PFP": [{"url": profile_pic}] if profile_pic else [],
-            "Followers": account_data.get("follower_count"),
-            "Following": account_data.get("following_count"),
-            "Media Count": account_data.get("media_count"),
-            "Full Name": account_data.get("full_name"),
-            "Bio Link": account_data.get("external_url"),
+            "Followers": get("follower_count"),
+            "Following": get("following_count"),
+            "Media Count": get("media_count"),
+            "Full Name": get("full_name"),
+            "Bio Link": get("external_url"),
             "Scraped": True,
             "API Error": "",  # Clear error on successful update
         }
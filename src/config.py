@@ -1,25 +1,72 @@
+import atexit
+import functools
 import logging
 import os
-from logging.handlers import RotatingFileHandler
-from typing import Any, Dict, List, TypeVar, cast
+import pickle
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, cast
 
 import yaml
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+logger = logging.getLogger(__name__)
+
+# A config value consisting solely of a ${VAR} reference
+ENV_VAR_PATTERN = re.compile(r"^\$\{([^}]+)\}\Z")
+# Location of a ${VAR} value in the config tree and the variable it names
+EnvRef = Tuple[Tuple[Any, ...], str]
+
+# Background thread writing queued log records to the real handlers
+_log_listener: Optional[QueueListener] = None
+# Handler feeding the listener and the logging section it was built from
+_log_handler: Optional[QueueHandler] = None
+_applied_log_config: Optional[Dict[str, Any]] = None
+
 T = TypeVar("T")
 KT = TypeVar("KT")
 VT = TypeVar("VT")
 
 
+def _stop_log_listener() -> None:
+    """Flush queued log records at interpreter exit"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+@functools.lru_cache(maxsize=8)
+def _read_parsed_yaml(config_path: str, key: Tuple[int, int, int]) -> bytes:
+    """Return the pickled (config, env_refs) for one version of a yaml file.
+
+    Memoized per process on the absolute path and the file's (mtime_ns, size,
+    inode). Nothing is written to disk, so the only input ever parsed is the
+    yaml file itself.
+    """
+    with open(config_path, "rb") as f:
+        config = yaml.load(f, Loader=SafeLoader)
+    return pickle.dumps((config, Config._find_env_refs(config)), protocol=5)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dotenv_once() -> bool:
+    """Read .env into the environment once per process"""
+    return load_dotenv()
+
+
 class Config:
     def __init__(self, config_path: str = "config.yaml"):
-        load_dotenv()
+        _load_dotenv_once()
         self.config: Dict[str, Any] = {}
 
         # Load and parse yaml file
         try:
-            with open(config_path, "r") as f:
-                self.config = yaml.safe_load(f)
+            self.config, self._env_refs = self._load_yaml(config_path)
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing config file: {e}")
         except FileNotFoundError:
@@ -29,25 +76,63 @@ class Config:
         self._resolve_env_vars()
         self._setup_logging()
 
+        if SafeLoader.__name__ == "CSafeLoader":
+            logger.debug("Parsing %s with libyaml CSafeLoader", config_path)
+        else:
+            logger.warning(
+                "libyaml not available, parsing %s with pure-Python SafeLoader",
+                config_path,
+            )
+
+    @staticmethod
+    def _load_yaml(config_path: str) -> Tuple[Dict[str, Any], List[EnvRef]]:
+        """Parse the yaml file, reusing the in-process copy while it is unchanged.
+
+        The cache holds the unresolved tree plus the locations of its ${VAR}
+        references, so resolved secrets are never kept in it.
+        """
+        config_path = os.path.abspath(config_path)
+        stat = os.stat(config_path)
+        # Unpickling gives every caller its own copy to resolve in place
+        return pickle.loads(
+            _read_parsed_yaml(
+                config_path, (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            )
+        )
+
+    @staticmethod
+    def _find_env_refs(config: Any) -> List[EnvRef]:
+        """Locate every ${VAR} value as a (key path, variable name) pair"""
+        env_refs: List[EnvRef] = []
+        stack: List[Tuple[Tuple[Any, ...], Any]] = [((), config)]
+        while stack:
+            path, container = stack.pop()
+            if isinstance(container, dict):
+                items = cast(Dict[Any, Any], container).items()
+            elif isinstance(container, list):
+                items = enumerate(cast(List[Any], container))
+            else:
+                continue
+
+            for key, value in items:
+                if isinstance(value, (dict, list)):
+                    stack.append((path + (key,), value))
+                elif isinstance(value, str):
+                    match = ENV_VAR_PATTERN.match(value)
+                    if match:
+                        env_refs.append((path + (key,), match.group(1)))
+        return env_refs
+
     def _resolve_env_vars(self) -> None:
-        """Resolve environment variables in config recursively"""
-
-        def resolve_vars(obj: Any) -> Any:
-            if isinstance(obj, dict):
-                return {
-                    cast(str, k): resolve_vars(v)
-                    for k, v in cast(Dict[str, Any], obj).items()
-                }
-            elif isinstance(obj, list):
-                return [resolve_vars(item) for item in cast(List[Any], obj)]
-            elif isinstance(obj, str) and obj.startswith("${") and obj.endswith("}"):
-                env_var = obj[2:-1]
-                if env_var not in os.environ:
-                    raise ValueError(f"Environment variable {env_var} not set")
-                return os.environ[env_var]
-            return obj
-
-        self.config = resolve_vars(self.config)
+        """Substitute environment variables at their precomputed locations"""
+        for path, env_var in self._env_refs:
+            if env_var not in os.environ:
+                raise ValueError(f"Environment variable {env_var} not set")
+
+            container: Any = self.config
+            for key in path[:-1]:
+                container = container[key]
+            container[path[-1]] = os.environ[env_var]
 
     def _setup_logging(self) -> None:
         """Setup logging configuration with file and console handlers"""
@@ -55,8 +140,12 @@ class Config:
         if not log_config:
             raise ValueError("Logging configuration not found in config file")
 
+        # Later Config() instances in the same process reuse the running setup
+        global _log_listener, _log_handler, _applied_log_config
         root_logger = logging.getLogger()
-        root_logger.setLevel(logging.DEBUG)
+        if log_config == _applied_log_config and _log_handler in root_logger.handlers:
+            return
+
         # Get log file path and create directory if needed
         log_path: str = log_config.get("file_path", "./logs/scraper.log")
         log_dir: str = os.path.dirname(log_path)
@@ -68,6 +157,7 @@ class Config:
                 log_path,
                 maxBytes=log_config.get("max_size", 10485760),  # 10MB default
                 backupCount=log_config.get("backup_count", 5),
+                delay=True,  # Open the file on the first record, not at setup
             ),
             logging.StreamHandler(),  # Console handler
         ]
@@ -77,17 +167,29 @@ class Config:
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
 
-        # Configure root logger
-        root_logger = logging.getLogger()
+        # Configure root logger, replacing any existing handlers
         root_logger.setLevel(log_config.get("level", "INFO"))
-
-        # Remove existing handlers and add new ones
-        for handler in root_logger.handlers[:]:
-            root_logger.removeHandler(handler)
+        root_logger.handlers.clear()
 
         for handler in handlers:
             handler.setFormatter(formatter)
-            root_logger.addHandler(handler)
+
+        # Loggers only enqueue records; file and console writes happen on the
+        # listener thread so they stay off the scraping path
+        if _log_listener is not None:
+            _log_listener.stop()
+            # Release the previous log file and console stream
+            for old_handler in _log_listener.handlers:
+                old_handler.close()
+        else:
+            atexit.register(_stop_log_listener)
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _log_listener.start()
+        _log_handler = QueueHandler(log_queue)
+        root_logger.addHandler(_log_handler)
+        _applied_log_config = dict(log_config)
 
     def get_rate_limits(self) -> Dict[str, Any]:
         rate_limits = self.config.get("rate_limits")
@@ -1,44 +1,232 @@
 import logging
-from typing import Any, Dict
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Mapping
+from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.config import Config
+from src.rate_limiter import RateLimiter
+from src.response_cache import ResponseCache
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; stdlib json also parses bytes
+    import json as _json
+
+# Pause once RapidAPI reports this few requests left in the current window
+RATE_LIMIT_RESERVE = 5
+# Longer resets are quota periods; waiting them out would stall the run
+MAX_RATE_LIMIT_WAIT = 60.0
+# Fail fast on unreachable hosts, but give slow responses time to arrive
+REQUEST_TIMEOUT = (5, 30)
+# Profile lookup path; the username is appended URL-quoted
+ACCOUNT_INFO_ENDPOINT = "/v1/info?username_or_id_or_url="
+# Oldest cached response served when the API is temporarily unavailable
+DEFAULT_CACHE_MAX_STALE = 24 * 3600
+# Set on responses served from the cache after a failed request
+STALE_RESPONSE_KEY = "_stale"
+# HTTP statuses worth falling back to a cached response for
+TRANSIENT_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+logger = logging.getLogger(__name__)
 
 
 class InstagramAPI:
+    __slots__ = (
+        "api_key",
+        "host",
+        "base_url",
+        "rate_limiter",
+        "session",
+        "cache_ttl",
+        "cache_max_stale",
+        "cache",
+        "_inflight",
+        "_inflight_lock",
+    )
+
     def __init__(self, config: Config):
         """Initialize Instagram API client with config"""
         instagram_config = config.get_instagram_config()
         self.api_key = instagram_config["api_key"]
         self.host = instagram_config["host"]
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
+        self.base_url = f"https://{self.host}"
 
-    def _make_request(self, endpoint: str) -> Dict[str, Any]:
-        """Make API request with rate limiting"""
-        url = f"https://{self.host}{endpoint}"
-        self.logger.debug(f"Starting API request to endpoint: {url}")
-        headers = {"x-rapidapi-key": self.api_key, "x-rapidapi-host": self.host}
+        # Shared across threads so concurrent callers respect the API limit
+        rate_limits = config.get_rate_limits()
+        self.rate_limiter = RateLimiter(
+            rate_limits["requests_per_minute"], burst=rate_limits.get("burst", 1)
+        )
+
+        # Persistent session so TCP/TLS connections are reused across calls
+        self.session = requests.Session()
+        self.session.headers.update(
+            {"x-rapidapi-key": self.api_key, "x-rapidapi-host": self.host}
+        )
+        retries = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries),
+        )
+
+        # Optional on-disk response cache, disabled when cache_ttl is 0
+        self.cache_ttl = float(instagram_config.get("cache_ttl", 0))
+        self.cache_max_stale = float(
+            instagram_config.get("cache_max_stale", DEFAULT_CACHE_MAX_STALE)
+        )
+        self.cache = (
+            ResponseCache(instagram_config.get("cache_path", "./cache/instagram.db"))
+            if self.cache_ttl > 0
+            else None
+        )
+        if self.cache is not None:
+            # Entries past both limits can never be served again
+            self.cache.prune(max(self.cache_ttl, self.cache_max_stale))
+
+        # Endpoint -> pending result, so concurrent duplicates share one fetch
+        self._inflight: Dict[str, "Future[Dict[str, Any]]"] = {}
+        self._inflight_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Release pooled connections and the response cache"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _shared_request(self, endpoint: str) -> Dict[str, Any]:
+        """Join an in-flight request for the same endpoint instead of repeating it"""
+        with self._inflight_lock:
+            future = self._inflight.get(endpoint)
+            is_leader = future is None
+            if future is None:
+                future = self._inflight[endpoint] = Future()
+
+        if not is_leader:
+            logger.debug("Joining in-flight request for %s", endpoint)
+            return future.result()
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            self.logger.debug("Response parsed successfully")
-            return response.json()
+            data = self._cached_request(endpoint)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[endpoint]
+
+    def _cached_request(self, endpoint: str) -> Dict[str, Any]:
+        """Serve a response from the cache, falling back to a recent stale copy
+        only when the API is temporarily unavailable"""
+        if self.cache is None:
+            return self._make_request(endpoint)
+
+        cached = self.cache.get(endpoint, max_age=self.cache_ttl)
+        if cached is not None:
+            logger.debug("Cache hit for endpoint: %s", endpoint)
+            return cached
+
+        try:
+            data = self._fetch(endpoint)
+        except Exception as e:
+            if not self._is_transient(e):
+                logger.error("API request error: %s", e)
+                return {}
+
+            stale = self.cache.get(endpoint, max_age=self.cache_max_stale)
+            if stale is None:
+                logger.error("API temporarily unavailable: %s", e)
+                return {}
+            logger.warning("Serving stale cached response for %s: %s", endpoint, e)
+            stale[STALE_RESPONSE_KEY] = True
+            return stale
+
+        if "data" in data:
+            self.cache.set(endpoint, data)
+        return data
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Whether a failed request is likely to succeed if tried again later"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            status = getattr(error.response, "status_code", None)
+            return status in TRANSIENT_STATUS_CODES
+        # RetryError means the adapter already gave up on 429/5xx responses
+        return isinstance(
+            error,
+            (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.RetryError,
+            ),
+        )
+
+    def _fetch(self, endpoint: str) -> Dict[str, Any]:
+        """Make a rate-limited API request, raising on any failure"""
+        url = self.base_url + endpoint
+        logger.debug("Starting API request to endpoint: %s", url)
+
+        self.rate_limiter.acquire()
+        response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()  # Raise an exception for bad status codes
+        self._apply_rate_limit_headers(response.headers)
+        data = _json.loads(response.content)
+        logger.debug("Response parsed successfully")
+        return data
+
+    def _make_request(self, endpoint: str) -> Dict[str, Any]:
+        """Make API request with rate limiting, returning {} on failure"""
+        try:
+            return self._fetch(endpoint)
 
         except requests.exceptions.Timeout:
-            self.logger.error("Request timed out")
+            logger.error("Request timed out")
             return {}
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"API request error: {e}")
+            logger.error("API request error: %s", e)
             return {}
         except Exception as e:
-            self.logger.error(f"An unexpected error occurred: {e}")
+            logger.error("An unexpected error occurred: %s", e)
             return {}
 
+    def _apply_rate_limit_headers(self, headers: Mapping[str, str]) -> None:
+        """Back off when RapidAPI reports the rate limit is nearly exhausted"""
+        remaining = headers.get("X-RateLimit-Requests-Remaining")
+        reset = headers.get("X-RateLimit-Requests-Reset")
+        if remaining is None or reset is None:
+            return
+
+        try:
+            remaining_count = int(remaining)
+            reset_seconds = float(reset)
+        except ValueError:
+            return
+
+        if remaining_count > RATE_LIMIT_RESERVE:
+            return
+        if reset_seconds > MAX_RATE_LIMIT_WAIT:
+            logger.warning(
+                "Only %d requests left until quota reset in %.0fs",
+                remaining_count,
+                reset_seconds,
+            )
+            return
+
+        logger.info(
+            "Rate limit nearly exhausted, pausing requests for %.1fs", reset_seconds
+        )
+        self.rate_limiter.defer(reset_seconds)
+
     def get_account_info(self, username: str) -> Dict[str, Any]:
         """Get account information"""
-        self.logger.info(f"Fetching account info for {username}")
-        endpoint = f"/v1/info?username_or_id_or_url={username}"
-        return self._make_request(endpoint)
+        logger.debug("Fetching account info for %s", username)
+        return self._shared_request(ACCOUNT_INFO_ENDPOINT + quote(username, safe=""))
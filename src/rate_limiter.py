@@ -0,0 +1,35 @@
+import threading
+import time
+
+
+class RateLimiter:
+    __slots__ = ("interval", "tolerance", "_next_slot", "_lock")
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """Thread-safe limiter spacing request starts evenly across a minute.
+
+        Up to ``burst`` requests may start back to back after an idle period;
+        the long-run rate stays at requests_per_minute.
+        """
+        self.interval = 60.0 / requests_per_minute
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller's request slot is reached."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            wait = slot - self.tolerance - now
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def defer(self, seconds: float) -> None:
+        """Hold back all further requests for at least the given seconds."""
+        with self._lock:
+            self._next_slot = max(
+                self._next_slot, time.monotonic() + seconds + self.tolerance
+            )
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; stdlib json also parses bytes
+    import json as _json
+
+
+class ResponseCache:
+    __slots__ = ("_conn", "_lock")
+
+    def __init__(self, path: str):
+        """SQLite-backed cache of API responses keyed by endpoint."""
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        # One connection shared by worker threads, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, body BLOB NOT NULL)"
+            )
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached body, or None if missing or older than max_age."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        fetched_at, body = row
+        if max_age is not None and time.time() - fetched_at > max_age:
+            return None
+        return _json.loads(body)
+
+    def set(self, key: str, body: Dict[str, Any]) -> None:
+        """Store a response body with the current timestamp."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, fetched_at, body) VALUES (?, ?, ?)",
+                (key, time.time(), _json.dumps(body)),
+            )
+
+    def prune(self, max_age: float) -> None:
+        """Delete entries older than max_age seconds."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM responses WHERE fetched_at < ?", (time.time() - max_age,)
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,64 +1,117 @@
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Tuple
 
-from src.airtable_client import AirtableClient
+from src.airtable_client import AirtableClient, RateLimitedApi
 from src.config import Config
-from src.instagram_api import InstagramAPI
+from src.instagram_api import STALE_RESPONSE_KEY, InstagramAPI
+
+logger = logging.getLogger(__name__)
 
 
 class InstagramScraper:
+    __slots__ = ("config", "instagram_api", "airtable_api", "max_concurrent_accounts")
+
     def __init__(self, config: Config):
         self.config = config
         self.instagram_api = InstagramAPI(config)
-        self.logger = logging.getLogger(__name__)
+        # Built on first use and shared by every Airtable client
+        self.airtable_api: RateLimitedApi | None = None
 
         # Rate limits
         rate_limits = config.get_rate_limits()
-        self.request_delay = 60.0 / rate_limits["requests_per_minute"]
-        self.account_delay = rate_limits["delay_between_accounts"]
+        self.max_concurrent_accounts = rate_limits.get("max_concurrent_accounts", 1)
 
-    def process_all_bases(self):
-        """Process all configured bases sequentially"""
+    def create_airtable_client(self) -> AirtableClient:
+        """Build an Airtable client for the configured base"""
         airtable_config = self.config.get_airtable_config()
-        airtable_client = AirtableClient(
+        if self.airtable_api is None:
+            self.airtable_api = RateLimitedApi(airtable_config["api_key"])
+        return AirtableClient(
             api_key=airtable_config["api_key"],
             base_id=airtable_config["base_id"],
             active_accounts_table=airtable_config["active_accounts_table"],
+            active_accounts_view=airtable_config.get("active_accounts_view"),
+            api=self.airtable_api,
+            write_cache_path=airtable_config.get("write_cache_path"),
         )
-        self.process_base(airtable_client)
+
+    def process_all_bases(self):
+        """Process all configured bases sequentially"""
+        self.process_base(self.create_airtable_client())
 
     def process_base(self, airtable_client: AirtableClient):
         """Process all accounts in a single base"""
-        self.logger.debug(f"Entering process_base")
+        logger.debug("Entering process_base")
         try:
-            self.logger.debug("About to call get_active_accounts")
+            logger.debug("About to call get_active_accounts")
             active_accounts = airtable_client.get_active_accounts()
-            self.logger.debug("Finished calling get_active_accounts")
+            logger.debug("Finished calling get_active_accounts")
 
             if not active_accounts:
-                self.logger.info(f"No active accounts found in base")
+                logger.info("No active accounts found in base")
                 return
 
-            total_accounts = len(active_accounts)
-            self.logger.info(f"Found {total_accounts} active accounts")
+            logger.info("Found %d active accounts", len(active_accounts))
+            self.process_accounts(
+                [(account_id, username) for account_id, username, _ in active_accounts],
+                airtable_client,
+            )
 
-            for i, (account_id, username, _) in enumerate(
-                active_accounts, 1
-            ):  # Note the _ to ignore followers here
-                self.logger.info(
-                    f"[{i}/{total_accounts}] Processing account: {username}"
-                )
+        except Exception as e:
+            logger.error("Error processing base: %s", e)
+            raise
+
+    def process_accounts(
+        self, accounts: List[Tuple[str, str]], airtable_client: AirtableClient
+    ) -> None:
+        """Process (account_id, username) pairs concurrently, then flush updates"""
+        total_accounts = len(accounts)
+
+        # Accounts are I/O-bound, so several run at once while the shared
+        # rate limiter in InstagramAPI keeps requests within the API limit.
+        # Buffered writes are flushed once the pool has drained.
+        with airtable_client.deferred_writes(), ThreadPoolExecutor(
+            max_workers=self.max_concurrent_accounts
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self._process_numbered_account,
+                    i,
+                    total_accounts,
+                    account_id,
+                    username,
+                    airtable_client,
+                ): username
+                for i, (account_id, username) in enumerate(accounts, 1)
+            }
+
+            succeeded = 0
+            for future in as_completed(futures):
+                username = futures[future]
                 try:
-                    self.process_account(account_id, username, airtable_client)
-                    if i < total_accounts:
-                        time.sleep(self.account_delay)
+                    if future.result():
+                        succeeded += 1
+                    else:
+                        logger.error("Failed to process account %s", username)
                 except Exception as e:
-                    self.logger.error(f"Error processing account {username}: {str(e)}")
-                    continue
+                    logger.error("Error processing account %s: %s", username, e)
 
-        except Exception as e:
-            self.logger.error(f"Error processing base: {str(e)}")
-            raise
+        logger.info(
+            "Processed %d of %d accounts successfully", succeeded, total_accounts
+        )
+
+    def _process_numbered_account(
+        self,
+        index: int,
+        total: int,
+        account_id: str,
+        username: str,
+        airtable_client: AirtableClient,
+    ) -> bool:
+        """Log progress when a worker picks up the account, then process it"""
+        logger.info("[%d/%d] Processing account: %s", index, total, username)
+        return self.process_account(account_id, username, airtable_client)
 
     def process_account(
         self, account_id: str, username: str, airtable_client: AirtableClient | None = None, skip_airtable_update: bool = False
@@ -69,25 +122,29 @@ class InstagramScraper:
         """
         try:
             # Always fetch and update account/profile info
-            self.logger.info(f"Fetching profile for {username}")
+            logger.debug("Fetching profile for %s", username)
             account_info = self.instagram_api.get_account_info(username)
 
             if not account_info or "data" not in account_info:
                 error_message = f"Failed to fetch account info for {username}"
-                self.logger.error(error_message)
+                logger.error(error_message)
                 if airtable_client and not skip_airtable_update:
                     airtable_client.log_error(account_id, error_message)
                 return False
 
             if not skip_airtable_update and airtable_client:
-                airtable_client.update_account(account_id, account_info["data"])
-                self.logger.info(f"Updated profile for {username}")
-            time.sleep(self.request_delay)
+                # A stale copy means the API is failing; keep any logged error
+                airtable_client.update_account(
+                    account_id,
+                    account_info["data"],
+                    clear_error=not account_info.get(STALE_RESPONSE_KEY),
+                )
+                logger.info("Queued profile update for %s", username)
             return True
 
         except Exception as e:
             error_message = f"Error processing account {username}: {str(e)}"
-            self.logger.error(error_message)
+            logger.error(error_message)
             if airtable_client and not skip_airtable_update:
                 airtable_client.log_error(account_id, error_message)
             return False
\ No newline at end of file
@@ -1,12 +1,182 @@
 import logging
 
-from src.airtable_client import AirtableClient
+import requests
+
+from src.airtable_client import AirtableClient, RateLimitedApi
 from src.config import Config
+from src.scraper import InstagramScraper
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
 
+def test_get_active_accounts_reuses_recent_fetch(monkeypatch):
+    """
+    A repeat call within the TTL should not query Airtable again.
+    """
+    airtable_client = AirtableClient("key", "appCacheTest", "tblAccounts")
+    calls = []
+
+    def fake_iterate(**kwargs):
+        calls.append(kwargs)
+        yield [{"id": "rec1", "fields": {"Username": "user1", "Followers": 10}}]
+
+    monkeypatch.setattr(airtable_client.accounts_table, "iterate", fake_iterate)
+
+    first = airtable_client.get_active_accounts()
+    first.clear()
+    second = airtable_client.get_active_accounts()
+
+    assert second == [("rec1", "user1", 10)]
+    assert len(calls) == 1
+
+
+def test_get_account_ids_batches_usernames(monkeypatch):
+    """
+    Usernames are looked up with one OR formula per chunk, not one query each.
+    """
+    airtable_client = AirtableClient("key", "appLookupTest", "tblAccounts")
+    formulas = []
+
+    def fake_iterate(formula, **kwargs):
+        formulas.append(str(formula))
+        yield [{"id": "rec1", "fields": {"Username": "user1"}}]
+
+    monkeypatch.setattr(airtable_client.accounts_table, "iterate", fake_iterate)
+
+    account_ids = airtable_client.get_account_ids(["user1", "user2"])
+
+    assert account_ids == {"user1": "rec1"}
+    assert formulas == ["OR({Username}='user1', {Username}='user2')"]
+
+
+def test_unchanged_account_update_is_skipped(tmp_path, monkeypatch):
+    """
+    Writing the same fields again should not send another batch.
+    """
+    airtable_client = AirtableClient(
+        "key",
+        "appWriteCacheTest",
+        "tblAccounts",
+        write_cache_path=str(tmp_path / "writes.db"),
+    )
+    batches = []
+    monkeypatch.setattr(airtable_client.accounts_table, "batch_update", batches.append)
+    account_data = {"username": "user1", "follower_count": 10}
+
+    airtable_client.update_account("rec1", account_data)
+    airtable_client.flush_account_updates()
+    airtable_client.update_account("rec1", account_data)
+    airtable_client.update_account("rec1", dict(account_data, follower_count=11))
+    airtable_client.flush_account_updates()
+
+    assert len(batches) == 2
+    assert batches[1][0]["fields"]["Followers"] == 11
+
+
+def http_error(status_code):
+    """Build the HTTPError pyairtable raises for a response with this status."""
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+
+def test_new_profile_picture_url_alone_is_not_written(tmp_path, monkeypatch):
+    """
+    A re-signed profile picture URL does not count as a changed record.
+    """
+    airtable_client = AirtableClient(
+        "key",
+        "appPictureDigestTest",
+        "tblAccounts",
+        write_cache_path=str(tmp_path / "writes.db"),
+    )
+    batches = []
+    monkeypatch.setattr(airtable_client.accounts_table, "batch_update", batches.append)
+    account_data = {"username": "user1", "profile_pic_url_hd": "https://cdn/p.jpg?sig=1"}
+
+    airtable_client.update_account("rec1", account_data)
+    airtable_client.flush_account_updates()
+    airtable_client.update_account(
+        "rec1", dict(account_data, profile_pic_url_hd="https://cdn/p.jpg?sig=2")
+    )
+    airtable_client.flush_account_updates()
+
+    assert len(batches) == 1
+
+
+def test_rejected_batch_is_retried_per_record(monkeypatch):
+    """
+    One rejected record should not keep the rest of its batch from being written.
+    """
+    airtable_client = AirtableClient("key", "appBatchRetryTest", "tblAccounts")
+    updated = []
+
+    def fake_batch_update(records):
+        raise http_error(422)
+
+    def fake_update(record_id, fields):
+        if record_id == "rec2":
+            raise http_error(422)
+        updated.append(record_id)
+
+    monkeypatch.setattr(airtable_client.accounts_table, "batch_update", fake_batch_update)
+    monkeypatch.setattr(airtable_client.accounts_table, "update", fake_update)
+
+    airtable_client.update_account("rec1", {"username": "user1"})
+    airtable_client.update_account("rec2", {"username": "user2"})
+    airtable_client.log_error("rec3", "Failed to fetch account info for user3")
+
+    assert airtable_client.flush_account_updates() is False
+    assert updated == ["rec1", "rec3"]
+
+
+def test_scraper_clients_share_one_rate_limited_api():
+    """
+    Every client built by the scraper reuses the same pooled RateLimitedApi.
+    """
+    config = Config.__new__(Config)
+    config.config = {
+        "rate_limits": {"requests_per_minute": 60000},
+        "instagram": {"api_key": "key", "host": "example.invalid", "cache_ttl": 0},
+        "airtable": {
+            "api_key": "key",
+            "base_id": "appSharedApiTest",
+            "active_accounts_table": "tblAccounts",
+        },
+    }
+    scraper = InstagramScraper(config)
+
+    first = scraper.create_airtable_client()
+    second = scraper.create_airtable_client()
+
+    assert isinstance(first.api, RateLimitedApi)
+    assert first.api is second.api
+
+
+def test_unavailable_batch_is_not_retried_per_record(monkeypatch):
+    """
+    A batch failing for reasons other than invalid data is not resent per record.
+    """
+    airtable_client = AirtableClient("key", "appBatchOutageTest", "tblAccounts")
+    updated = []
+
+    def fake_batch_update(records):
+        raise http_error(503)
+
+    monkeypatch.setattr(airtable_client.accounts_table, "batch_update", fake_batch_update)
+    monkeypatch.setattr(
+        airtable_client.accounts_table,
+        "update",
+        lambda record_id, fields: updated.append(record_id),
+    )
+
+    airtable_client.update_account("rec1", {"username": "user1"})
+
+    assert airtable_client.flush_account_updates() is False
+    assert updated == []
+
+
 def test_airtable_live():
     """
     Live test for AirtableClient.
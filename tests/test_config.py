@@ -0,0 +1,108 @@
+import logging
+import os
+
+from src import config as config_module
+from src.config import Config
+
+
+def test_load_yaml_refreshes_cache_when_file_changes(tmp_path):
+    """
+    The parsed copy is reused until the yaml file itself changes.
+    """
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("rate_limits:\n  requests_per_minute: 240\n")
+
+    config, _ = Config._load_yaml(str(config_path))
+    assert config == {"rate_limits": {"requests_per_minute": 240}}
+
+    config_path.write_text("rate_limits:\n  requests_per_minute: 60\n")
+    config, _ = Config._load_yaml(str(config_path))
+    assert config == {"rate_limits": {"requests_per_minute": 60}}
+
+
+def test_resolve_env_vars_in_nested_values(monkeypatch):
+    """
+    ${VAR} references are substituted at any depth, other values untouched.
+    """
+    monkeypatch.setenv("SCRAPER_TEST_KEY", "secret")
+    config = Config.__new__(Config)
+    config.config = {
+        "airtable": {"api_key": "${SCRAPER_TEST_KEY}", "tables": ["${SCRAPER_TEST_KEY}"]},
+        "logging": {"level": "INFO", "max_size": 10485760},
+    }
+    config._env_refs = Config._find_env_refs(config.config)
+
+    config._resolve_env_vars()
+
+    assert config.config == {
+        "airtable": {"api_key": "secret", "tables": ["secret"]},
+        "logging": {"level": "INFO", "max_size": 10485760},
+    }
+
+
+def test_load_yaml_cache_stays_in_process(tmp_path, monkeypatch):
+    """
+    Only the unresolved ${VAR} references are cached, and never on disk.
+    """
+    monkeypatch.setenv("SCRAPER_TEST_KEY", "secret")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text('airtable:\n  api_key: "${SCRAPER_TEST_KEY}"\n')
+
+    _, env_refs = Config._load_yaml(str(config_path))
+
+    assert env_refs == [(("airtable", "api_key"), "SCRAPER_TEST_KEY")]
+    assert os.listdir(tmp_path) == ["config.yaml"]
+
+
+def test_load_yaml_returns_independent_copies(tmp_path):
+    """
+    Resolving one loaded config in place must not leak into the next load.
+    """
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text('airtable:\n  api_key: "${SCRAPER_TEST_KEY}"\n')
+
+    first, _ = Config._load_yaml(str(config_path))
+    first["airtable"]["api_key"] = "secret"
+    second, _ = Config._load_yaml(str(config_path))
+
+    assert second == {"airtable": {"api_key": "${SCRAPER_TEST_KEY}"}}
+
+
+def test_setup_logging_runs_once_per_logging_section(tmp_path):
+    """
+    A second Config() with the same logging section keeps the running listener.
+    """
+    log_path = tmp_path / "logs" / "scraper.log"
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f'logging:\n  level: "INFO"\n  file_path: "{log_path}"\n')
+
+    Config(config_path=str(config_path))
+    listener = config_module._log_listener
+    Config(config_path=str(config_path))
+
+    assert config_module._log_listener is listener
+    assert logging.getLogger().handlers.count(config_module._log_handler) == 1
+
+
+def test_setup_logging_closes_replaced_handlers(tmp_path):
+    """
+    Changing the logging section closes the previous file handler.
+    """
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        f'logging:\n  level: "INFO"\n  file_path: "{tmp_path / "first.log"}"\n'
+    )
+    Config(config_path=str(config_path))
+    file_handler = config_module._log_listener.handlers[0]
+    logging.getLogger(__name__).info("open the log file")
+    # Drain the queue so the record has reached the file
+    config_module._log_listener.stop()
+    config_module._log_listener.start()
+    assert file_handler.stream is not None
+
+    config_path.write_text(
+        f'logging:\n  level: "INFO"\n  file_path: "{tmp_path / "second.log"}"\n'
+    )
+    Config(config_path=str(config_path))
+
+    assert file_handler.stream is None
@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.config import Config
+from src.instagram_api import STALE_RESPONSE_KEY, InstagramAPI
+
+
+def make_api() -> InstagramAPI:
+    """Build an InstagramAPI from an in-memory config without response caching."""
+    config = Config.__new__(Config)
+    config.config = {
+        "rate_limits": {"requests_per_minute": 60000},
+        "instagram": {"api_key": "key", "host": "example.invalid", "cache_ttl": 0},
+    }
+    return InstagramAPI(config)
+
+
+def test_concurrent_duplicate_requests_share_one_fetch(monkeypatch):
+    """
+    Simultaneous lookups of the same username should hit the API only once.
+    """
+    api = make_api()
+    calls = []
+    release = threading.Event()
+
+    def fake_make_request(self, endpoint):
+        calls.append(endpoint)
+        release.wait(1)
+        return {"data": {"username": "user1"}}
+
+    monkeypatch.setattr(InstagramAPI, "_make_request", fake_make_request)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(api.get_account_info, "user1") for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result == {"data": {"username": "user1"}} for result in results)
+
+
+def make_cached_api(tmp_path) -> InstagramAPI:
+    """Build an InstagramAPI with a response cache whose entries are always expired."""
+    config = Config.__new__(Config)
+    config.config = {
+        "rate_limits": {"requests_per_minute": 60000},
+        "instagram": {
+            "api_key": "key",
+            "host": "example.invalid",
+            "cache_path": str(tmp_path / "instagram.db"),
+            "cache_ttl": 60,
+            "cache_max_stale": 3600,
+        },
+    }
+    api = InstagramAPI(config)
+    api.cache.set("/cached", {"data": {"username": "user1"}})
+    api.cache._conn.execute("UPDATE responses SET fetched_at = fetched_at - 120")
+    return api
+
+
+def fail_with_status(monkeypatch, status_code):
+    """Make every API fetch raise an HTTPError with the given status."""
+
+    def fake_fetch(self, endpoint):
+        response = requests.Response()
+        response.status_code = status_code
+        raise requests.exceptions.HTTPError(response=response)
+
+    monkeypatch.setattr(InstagramAPI, "_fetch", fake_fetch)
+
+
+def test_stale_response_served_on_server_error(monkeypatch, tmp_path):
+    api = make_cached_api(tmp_path)
+    fail_with_status(monkeypatch, 503)
+
+    result = api._cached_request("/cached")
+
+    assert result["data"] == {"username": "user1"}
+    assert result[STALE_RESPONSE_KEY] is True
+
+
+def test_stale_response_not_served_on_client_error(monkeypatch, tmp_path):
+    api = make_cached_api(tmp_path)
+    fail_with_status(monkeypatch, 404)
+
+    assert api._cached_request("/cached") == {}
+
+
+def test_stale_response_not_served_past_max_stale(monkeypatch, tmp_path):
+    api = make_cached_api(tmp_path)
+    api.cache._conn.execute("UPDATE responses SET fetched_at = fetched_at - 7200")
+    fail_with_status(monkeypatch, 503)
+
+    assert api._cached_request("/cached") == {}
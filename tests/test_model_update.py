@@ -50,7 +50,9 @@ def test_model_update():
 
         # --- Update the account in Airtable ---
         logging.info(f"Updating account {username} in Airtable...")
-        update_successful = airtable_client.update_account(account_id, account_info["data"])
+        update_successful = airtable_client.update_account(
+            account_id, account_info["data"]
+        ) and airtable_client.flush_account_updates()
 
         assert update_successful, f"Failed to update account {username} in Airtable."
         
@@ -0,0 +1,71 @@
+import time
+
+from pyairtable import Api
+
+from src.airtable_client import AirtableClient, RateLimitedApi, get_base_rate_limiter
+from src.rate_limiter import RateLimiter
+
+
+def test_rate_limiter_spaces_requests():
+    """
+    Consecutive acquisitions should be spaced by the configured interval.
+    """
+    limiter = RateLimiter(requests_per_minute=1200)  # 50ms between requests
+
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    # The first slot is immediate, the remaining three wait one interval each
+    assert elapsed >= 3 * limiter.interval * 0.9
+
+
+def test_rate_limiter_defer_delays_next_request():
+    """
+    A deferral should hold back the next acquisition for the given time.
+    """
+    limiter = RateLimiter(requests_per_minute=60000)
+    limiter.defer(0.1)
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limiter_allows_initial_burst():
+    """
+    Up to `burst` requests start immediately, later ones keep the interval.
+    """
+    limiter = RateLimiter(requests_per_minute=600, burst=3)  # 100ms interval
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start < limiter.interval / 2
+
+    limiter.acquire()
+    assert time.monotonic() - start >= limiter.interval * 0.9
+
+
+def test_airtable_requests_share_limiter_per_base(monkeypatch):
+    """
+    A shared Api should pace each request on the limiter of its own base.
+    """
+    monkeypatch.setattr(Api, "request", lambda self, method, url, **kwargs: None)
+    api = RateLimitedApi("key")
+    first = AirtableClient("key", "appSharedBase", "tblAccounts", api=api)
+    other = AirtableClient("key", "appOtherBase", "tblAccounts", api=api)
+
+    first.api.request("GET", first.accounts_table.urls.records)
+
+    assert first.api is other.api
+    assert get_base_rate_limiter("appSharedBase")._next_slot > 0
+    assert get_base_rate_limiter("appOtherBase")._next_slot == 0
+
+
+if __name__ == "__main__":
+    test_rate_limiter_spaces_requests()
+    test_rate_limiter_defer_delays_next_request()
+    test_rate_limiter_allows_initial_burst()
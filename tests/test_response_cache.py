@@ -0,0 +1,20 @@
+import time
+
+from src.response_cache import ResponseCache
+
+
+def test_response_cache_respects_max_age(tmp_path):
+    """
+    Fresh entries are served within max_age and stale ones only without it.
+    """
+    cache = ResponseCache(str(tmp_path / "responses.db"))
+    cache.set("/v1/info?username_or_id_or_url=someone", {"data": {"username": "someone"}})
+
+    assert cache.get("/v1/info?username_or_id_or_url=someone", max_age=60) == {
+        "data": {"username": "someone"}
+    }
+    assert cache.get("/v1/info?username_or_id_or_url=missing") is None
+
+    time.sleep(0.05)
+    assert cache.get("/v1/info?username_or_id_or_url=someone", max_age=0.01) is None
+    assert cache.get("/v1/info?username_or_id_or_url=someone") is not None
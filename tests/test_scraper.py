@@ -42,6 +42,7 @@ def test_scraper_live():
         # --- Run the Scraper for the single username ---
         logging.info(f"Calling process_account for {username}...")
         scraper.process_account(account_id, username, airtable_client)
+        airtable_client.flush_account_updates()
         logging.info("""--- Scraper Test Finished ---""")
 
     except Exception as e:
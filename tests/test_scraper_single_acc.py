@@ -1,11 +1,23 @@
 import logging
+
+import pytest
+
 from src.config import Config
 from src.scraper import InstagramScraper
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 
-def test_scraper_single_account():
+@pytest.fixture(scope="session")
+def scraper():
+    """
+    Build the configuration and scraper once for the whole test session.
+    """
+    try:
+        return InstagramScraper(Config(config_path='config.yaml'))
+    except Exception as e:
+        pytest.skip(f"Scraper configuration unavailable: {e}")
+
+
+def test_scraper_single_account(scraper):
     """
     Live test for InstagramScraper with a single, hardcoded username.
     This test will make real API calls to Instagram but will skip Airtable updates.
@@ -13,12 +25,6 @@ def test_scraper_single_account():
     try:
         logging.info("--- Starting Single Account Scraper Test ---")
 
-        # Load configuration
-        config = Config(config_path='config.yaml')
-
-        # Initialize InstagramScraper
-        scraper = InstagramScraper(config)
-
         # Define the username to test
         username = "maddie_wave_90"
         account_id = "dummy_id" # Not used for Airtable update in this test
@@ -32,4 +38,4 @@ def test_scraper_single_account():
         logging.error(f"An error occurred during the single account scraper test: {e}", exc_info=True)
 
 if __name__ == "__main__":
-    test_scraper_single_account()
\ No newline at end of file
+    test_scraper_single_account(InstagramScraper(Config(config_path='config.yaml')))